@@ -896,6 +896,295 @@ def nsl01_scan(integer[:, :] h):
     return np.asarray(vstat0), np.asarray(vstat1)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def genotypes_max_allele(integer[:, :, :] g1, integer[:, :, :] g2):
+    # find the highest allele index across two genotype arrays in a single
+    # kernel call, with no intermediate allocations
+
+    cdef:
+        Py_ssize_t i, j, k
+        integer m, x
+
+    m = 0
+    with nogil:
+        for i in range(g1.shape[0]):
+            for j in range(g1.shape[1]):
+                for k in range(g1.shape[2]):
+                    x = g1[i, j, k]
+                    if x > m:
+                        m = x
+        for i in range(g2.shape[0]):
+            for j in range(g2.shape[1]):
+                for k in range(g2.shape[2]):
+                    x = g2[i, j, k]
+                    if x > m:
+                        m = x
+
+    return m
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def mendel_errors_int8(cnp.int8_t[:, :, :] parent_genotypes,
+                       cnp.int8_t[:, :, :] progeny_genotypes):
+
+    cdef:
+        Py_ssize_t n_variants, n_progeny, i, j
+        cnp.int8_t p1a, p1b, p2a, p2b, a, b, err
+        bint shared
+        cnp.int8_t[:, :] me
+
+    # guard conditions
+    assert parent_genotypes.shape[1] == 2
+    assert parent_genotypes.shape[2] == 2
+    assert progeny_genotypes.shape[2] == 2
+    assert parent_genotypes.shape[0] == progeny_genotypes.shape[0]
+
+    n_variants = progeny_genotypes.shape[0]
+    n_progeny = progeny_genotypes.shape[1]
+
+    # setup outputs
+    me = np.zeros((n_variants, n_progeny), dtype='i1')
+
+    # iterate over variants
+    for i in range(n_variants):
+
+        # access parental alleles
+        p1a = parent_genotypes[i, 0, 0]
+        p1b = parent_genotypes[i, 0, 1]
+        p2a = parent_genotypes[i, 1, 0]
+        p2b = parent_genotypes[i, 1, 1]
+
+        # check for any missing calls in parents
+        if p1a < 0 or p1b < 0 or p2a < 0 or p2b < 0:
+            continue
+
+        # do the parents share any alleles?
+        shared = (p1a == p2a or p1a == p2b or p1b == p2a or p1b == p2b)
+
+        # iterate over progeny
+        for j in range(n_progeny):
+
+            # access progeny alleles
+            a = progeny_genotypes[i, j, 0]
+            b = progeny_genotypes[i, j, 1]
+
+            if a < 0 and b < 0:
+                # missing call
+                continue
+
+            elif a < 0 or b < 0:
+                # half-missing call, a single non-parental allele counts as
+                # one error
+                if a < 0:
+                    a = b
+                if a != p1a and a != p1b and a != p2a and a != p2b:
+                    me[i, j] = 1
+
+            else:
+
+                if a == b:
+                    # homozygous progeny, errors are allele copies in excess
+                    # of the number of parents carrying the allele
+                    err = 2
+                    if a == p1a or a == p1b:
+                        err -= 1
+                    if a == p2a or a == p2b:
+                        err -= 1
+                else:
+                    # heterozygous progeny, count non-parental alleles
+                    err = 0
+                    if a != p1a and a != p1b and a != p2a and a != p2b:
+                        err += 1
+                    if b != p1a and b != p1b and b != p2a and b != p2b:
+                        err += 1
+
+                # detect uniparental inheritance, where parents share no
+                # alleles and the progeny genotype is identical to one or
+                # the other parent
+                if not shared and ((a == p1a and b == p1b) or
+                                   (a == p1b and b == p1a) or
+                                   (a == p2a and b == p2b) or
+                                   (a == p2b and b == p2a)):
+                    err = 1
+
+                me[i, j] = err
+
+    return np.asarray(me)
+
+
+cdef inline cnp.uint8_t paint_allele(cnp.int8_t x, cnp.int8_t p1,
+                                     cnp.int8_t p2) nogil:
+    # N.B., state values must match the INHERIT_* constants defined in
+    # allel.stats.mendel
+    if x < 0:
+        # missing allele
+        return 7
+    elif p1 < 0 or p2 < 0:
+        # either or both parental alleles missing
+        return 6
+    elif p1 == p2:
+        # non-segregating
+        if x == p1:
+            if p1 == 0:
+                # reference allele
+                return 3
+            else:
+                # non-reference allele
+                return 4
+        else:
+            # non-parental allele
+            return 5
+    else:
+        # segregating
+        if x == p1:
+            # inherited from first parental haplotype
+            return 1
+        elif x == p2:
+            # inherited from second parental haplotype
+            return 2
+        else:
+            # non-parental allele
+            return 5
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def paint_transmission_int8(cnp.int8_t[:, :] parent_haplotypes,
+                            cnp.int8_t[:, :] progeny_haplotypes):
+
+    cdef:
+        Py_ssize_t n_variants, n_progeny, i, j
+        cnp.int8_t p1, p2
+        cnp.uint8_t[:, :] painting
+
+    # guard conditions
+    assert parent_haplotypes.shape[1] == 2
+    assert parent_haplotypes.shape[0] == progeny_haplotypes.shape[0]
+
+    n_variants = progeny_haplotypes.shape[0]
+    n_progeny = progeny_haplotypes.shape[1]
+
+    # setup outputs
+    painting = np.zeros((n_variants, n_progeny), dtype='u1')
+
+    # iterate over variants
+    for i in range(n_variants):
+
+        # access parental alleles
+        p1 = parent_haplotypes[i, 0]
+        p2 = parent_haplotypes[i, 1]
+
+        # iterate over progeny
+        for j in range(n_progeny):
+            painting[i, j] = paint_allele(progeny_haplotypes[i, j], p1, p2)
+
+    return np.asarray(painting)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def mendel_errors_and_paint_int8(cnp.int8_t[:, :, :] parent_genotypes,
+                                 cnp.int8_t[:, :, :] progeny_genotypes):
+    # N.B., progeny genotypes are assumed to be phased, with the first allele
+    # inherited from the first parent and the second allele from the second
+    # parent
+
+    cdef:
+        Py_ssize_t n_variants, n_progeny, i, j
+        cnp.int8_t p1a, p1b, p2a, p2b, a, b, err
+        bint shared, parent_missing
+        cnp.int8_t[:, :] me
+        cnp.uint8_t[:, :, :] painting
+
+    # guard conditions
+    assert parent_genotypes.shape[1] == 2
+    assert parent_genotypes.shape[2] == 2
+    assert progeny_genotypes.shape[2] == 2
+    assert parent_genotypes.shape[0] == progeny_genotypes.shape[0]
+
+    n_variants = progeny_genotypes.shape[0]
+    n_progeny = progeny_genotypes.shape[1]
+
+    # setup outputs
+    me = np.zeros((n_variants, n_progeny), dtype='i1')
+    painting = np.zeros((n_variants, n_progeny, 2), dtype='u1')
+
+    # iterate over variants
+    for i in range(n_variants):
+
+        # access parental alleles
+        p1a = parent_genotypes[i, 0, 0]
+        p1b = parent_genotypes[i, 0, 1]
+        p2a = parent_genotypes[i, 1, 0]
+        p2b = parent_genotypes[i, 1, 1]
+
+        # check for any missing calls in parents
+        parent_missing = p1a < 0 or p1b < 0 or p2a < 0 or p2b < 0
+
+        # do the parents share any alleles?
+        shared = (p1a == p2a or p1a == p2b or p1b == p2a or p1b == p2b)
+
+        # iterate over progeny
+        for j in range(n_progeny):
+
+            # access progeny alleles
+            a = progeny_genotypes[i, j, 0]
+            b = progeny_genotypes[i, j, 1]
+
+            # paint each progeny allele against the transmitting parent
+            painting[i, j, 0] = paint_allele(a, p1a, p1b)
+            painting[i, j, 1] = paint_allele(b, p2a, p2b)
+
+            # compute mendel errors; same logic as mendel_errors_int8
+            if parent_missing:
+                continue
+
+            if a < 0 and b < 0:
+                # missing call
+                continue
+
+            elif a < 0 or b < 0:
+                # half-missing call, a single non-parental allele counts as
+                # one error
+                if a < 0:
+                    a = b
+                if a != p1a and a != p1b and a != p2a and a != p2b:
+                    me[i, j] = 1
+
+            else:
+
+                if a == b:
+                    # homozygous progeny, errors are allele copies in excess
+                    # of the number of parents carrying the allele
+                    err = 2
+                    if a == p1a or a == p1b:
+                        err -= 1
+                    if a == p2a or a == p2b:
+                        err -= 1
+                else:
+                    # heterozygous progeny, count non-parental alleles
+                    err = 0
+                    if a != p1a and a != p1b and a != p2a and a != p2b:
+                        err += 1
+                    if b != p1a and b != p1b and b != p2a and b != p2b:
+                        err += 1
+
+                # detect uniparental inheritance, where parents share no
+                # alleles and the progeny genotype is identical to one or
+                # the other parent
+                if not shared and ((a == p1a and b == p1b) or
+                                   (a == p1b and b == p1a) or
+                                   (a == p2a and b == p2b) or
+                                   (a == p2b and b == p2a)):
+                    err = 1
+
+                me[i, j] = err
+
+    return np.asarray(me), np.asarray(painting)
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def phase_progeny_by_transmission(integer[:, :, :] g):
@@ -922,64 +1211,71 @@ def phase_progeny_by_transmission(integer[:, :, :] g):
     # setup outputs
     is_phased = np.zeros((n_variants, n_samples), dtype='u1')
 
-    # iterate over variants
-    for i in range(n_variants):
+    # iterate over variants; N.B., the loop releases the GIL so callers can
+    # partition the variant axis across threads
+    with nogil:
+        for i in range(n_variants):
 
-        # access parental genotypes
-        ma1 = g[i, 0, 0]  # maternal allele 1
-        ma2 = g[i, 0, 1]  # maternal allele 2
-        pa1 = g[i, 1, 0]  # paternal allele 1
-        pa2 = g[i, 1, 1]  # paternal allele 2
+            # access parental genotypes
+            ma1 = g[i, 0, 0]  # maternal allele 1
+            ma2 = g[i, 0, 1]  # maternal allele 2
+            pa1 = g[i, 1, 0]  # paternal allele 1
+            pa2 = g[i, 1, 1]  # paternal allele 2
 
-        # check for any missing calls in parents
-        if ma1 < 0 or ma2 < 0 or pa1 < 0 or pa2 < 0:
-            continue
+            # check for any missing calls in parents
+            if ma1 < 0 or ma2 < 0 or pa1 < 0 or pa2 < 0:
+                continue
 
-        # parental allele counts
-        mac[:] = 0  # reset to zero
-        pac[:] = 0  # reset to zero
-        mac[ma1] = 1
-        mac[ma2] = 1
-        pac[pa1] = 1
-        pac[pa2] = 1
+            # parental allele counts
+            mac[ma1] = 1
+            mac[ma2] = 1
+            pac[pa1] = 1
+            pac[pa2] = 1
 
-        # iterate over progeny
-        for j in range(2, n_progeny + 2):
+            # iterate over progeny
+            for j in range(2, n_progeny + 2):
 
-            # access progeny alleles
-            a1 = g[i, j, 0]
-            a2 = g[i, j, 1]
+                # access progeny alleles
+                a1 = g[i, j, 0]
+                a2 = g[i, j, 1]
 
-            if a1 < 0 or a2 < 0:  # child is missing
-                continue
+                if a1 < 0 or a2 < 0:  # child is missing
+                    continue
+
+                elif a1 == a2:  # child is homozygous
 
-            elif a1 == a2:  # child is homozygous
+                    if mac[a1] > 0 and pac[a1] > 0:  # Mendelian consistent
+                        # trivially phase the child
+                        is_phased[i, j] = 1
 
-                if mac[a1] > 0 and pac[a1] > 0:  # Mendelian consistent
-                    # trivially phase the child
-                    is_phased[i, j] = 1
+                else:  # child is heterozygous
 
-            else:  # child is heterozygous
+                    if mac[a1] > 0 and pac[a1] == 0 and pac[a2] > 0:
+                        # allele 1 is unique to mother, no need to swap
+                        is_phased[i, j] = 1
 
-                if mac[a1] > 0 and pac[a1] == 0 and pac[a2] > 0:
-                    # allele 1 is unique to mother, no need to swap
-                    is_phased[i, j] = 1
+                    elif mac[a2] > 0 and pac[a2] == 0 and pac[a1] > 0:
+                        # allele 2 is unique to mother, swap child alleles
+                        g[i, j, 0] = a2
+                        g[i, j, 1] = a1
+                        is_phased[i, j] = 1
 
-                elif mac[a2] > 0 and pac[a2] == 0 and pac[a1] > 0:
-                    # allele 2 is unique to mother, swap child alleles
-                    g[i, j, 0] = a2
-                    g[i, j, 1] = a1
-                    is_phased[i, j] = 1
+                    elif pac[a1] > 0 and mac[a1] == 0 and mac[a2] > 0:
+                        # allele 1 is unique to father, swap child alleles
+                        g[i, j, 0] = a2
+                        g[i, j, 1] = a1
+                        is_phased[i, j] = 1
 
-                elif pac[a1] > 0 and mac[a1] == 0 and mac[a2] > 0:
-                    # allele 1 is unique to father, swap child alleles
-                    g[i, j, 0] = a2
-                    g[i, j, 1] = a1
-                    is_phased[i, j] = 1
+                    elif pac[a2] > 0 and mac[a2] == 0 and mac[a1] > 0:
+                        # allele 2 is unique to father, no need to swap
+                        is_phased[i, j] = 1
 
-                elif pac[a2] > 0 and mac[a2] == 0 and mac[a1] > 0:
-                    # allele 2 is unique to father, no need to swap
-                    is_phased[i, j] = 1
+            # reset parental allele counts for the next variant; cheaper
+            # than re-zeroing the whole arrays
+            mac[ma1] = 0
+            mac[ma2] = 0
+            pac[pa1] = 0
+            pac[pa2] = 0
 
     return is_phased
 
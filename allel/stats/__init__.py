@@ -56,7 +56,8 @@ from .sf import sfs, sfs_folded, sfs_scaled, sfs_folded_scaled, \
 from .misc import plot_variant_locator, tabulate_state_transitions, \
     tabulate_state_blocks
 
-from .mendel import mendel_errors, paint_transmission, \
+from .mendel import mendel_errors, paint_transmission, mendel_errors_and_paint, \
+    MendelWorkspace, \
     phase_progeny_by_transmission, phase_parents_by_transmission, \
     phase_by_transmission, INHERIT_MISSING, INHERIT_NONPARENTAL, INHERIT_NONSEG_ALT, \
     INHERIT_NONSEG_REF, INHERIT_PARENT1, INHERIT_PARENT2, INHERIT_PARENT_MISSING, \
@@ -15,6 +15,7 @@ from allel.stats.window import windowed_statistic, moving_statistic
 from allel.stats.diversity import mean_pairwise_difference, \
     mean_pairwise_difference_between
 from allel.stats.misc import jackknife
+from allel.stats.admixture import patterson_f2, h_hat
 from allel.chunked import get_blen_array
 
 
@@ -353,7 +354,6 @@ def patterson_fst(aca, acb):
 
     """
 
-    from allel.stats.admixture import patterson_f2, h_hat
     num = patterson_f2(aca, acb)
     den = num + h_hat(aca) + h_hat(acb)
 
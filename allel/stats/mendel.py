@@ -2,17 +2,109 @@
 from __future__ import absolute_import, print_function, division
 
 
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+
 import numpy as np
 
 
 from allel.compat import memoryview_safe
 from allel.model.ndarray import GenotypeArray, HaplotypeArray
 from allel.util import check_ploidy, check_min_samples, check_type, check_dtype
-from allel.opt.stats import phase_progeny_by_transmission as _opt_phase_progeny_by_transmission, \
+from allel.opt.stats import genotypes_max_allele as _opt_genotypes_max_allele, \
+    mendel_errors_int8 as _opt_mendel_errors_int8, \
+    mendel_errors_and_paint_int8 as _opt_mendel_errors_and_paint_int8, \
+    paint_transmission_int8 as _opt_paint_transmission_int8, \
+    phase_progeny_by_transmission as _opt_phase_progeny_by_transmission, \
     phase_parents_by_transmission as _opt_phase_parents_by_transmission
 
 
-def mendel_errors(parent_genotypes, progeny_genotypes):
+# lookup table giving the number of set bits in each possible byte value,
+# used to count alleles packed into uint64 bitmasks
+_popcount_lut = np.array([bin(i).count('1') for i in range(256)], dtype='u1')
+
+
+def _allele_mask(alleles, workspace=None, token=None):
+    """Pack the alleles called in each genotype into a uint64 bitmask, with
+    one bit set per distinct allele. Missing allele calls contribute no bits.
+    Assumes all alleles are < 64."""
+    alleles = np.asarray(alleles)
+    is_called = alleles >= 0
+    shifts = np.where(is_called, alleles, 0).astype(np.uint64)
+    if workspace is None:
+        bits = np.empty(alleles.shape, dtype=np.uint64)
+        mask = np.empty(alleles.shape[:-1], dtype=np.uint64)
+    else:
+        bits = workspace.get(alleles.shape, np.uint64, ('bits', token))
+        mask = workspace.get(alleles.shape[:-1], np.uint64, ('mask', token))
+    np.left_shift(np.uint64(1), shifts, out=bits)
+    bits[~is_called] = 0
+    return np.bitwise_or.reduce(bits, axis=-1, out=mask)
+
+
+if hasattr(np, 'bitwise_count'):
+
+    def _popcount(x):
+        """Count the number of set bits in each element of a uint64 array."""
+        return np.bitwise_count(x).astype(np.int8)
+
+else:
+
+    def _popcount(x):
+        """Count the number of set bits in each element of a uint64 array."""
+        b = np.ascontiguousarray(x).view('u1').reshape(x.shape + (8,))
+        return _popcount_lut[b].sum(axis=-1, dtype=np.int8)
+
+
+class MendelWorkspace(object):
+    """Cache of scratch buffers keyed by shape and dtype, for reuse across
+    repeated :func:`mendel_errors` calls over similarly-shaped inputs (e.g.,
+    a loop over chromosomes or windows), avoiding per-call allocation of the
+    largest temporary arrays. Not safe for concurrent use."""
+
+    def __init__(self):
+        self._buffers = dict()
+
+    def get(self, shape, dtype, token=None):
+        """Obtain a scratch buffer of the given shape and dtype, allocating
+        it on first use. Contents are arbitrary. The token distinguishes
+        buffers needed simultaneously with the same shape and dtype."""
+        key = (shape, np.dtype(dtype).str, token)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buf
+        return buf
+
+
+# minimum number of variants before the progeny phasing workload is
+# partitioned across threads, to avoid thread pool overhead on small inputs
+_PHASE_PARALLEL_THRESHOLD = 10000
+
+
+def _phase_progeny(values, use_threads=True):
+    """Run the progeny phasing kernel on genotype values, modifying them
+    in-place and returning the is_phased array. Phasing decisions are
+    independent between variants, so for large inputs the variant axis is
+    partitioned across threads; the kernel releases the GIL, so blocks phase
+    in parallel."""
+    n_variants = values.shape[0]
+    n_threads = min(4, multiprocessing.cpu_count())
+    if (not use_threads or n_variants < _PHASE_PARALLEL_THRESHOLD or
+            n_threads < 2):
+        return np.asarray(_opt_phase_progeny_by_transmission(values))
+    blen = -(-n_variants // n_threads)
+    blocks = [values[start:start + blen] for start in range(0, n_variants, blen)]
+    pool = ThreadPool(n_threads)
+    results = pool.map(_opt_phase_progeny_by_transmission, blocks)
+    pool.close()
+    pool.join()
+    return np.concatenate([np.asarray(r) for r in results], axis=0)
+
+
+def mendel_errors(parent_genotypes, progeny_genotypes, chunk_size=65536,
+                  workspace=None):
     """Locate genotype calls not consistent with Mendelian transmission of
     alleles.
 
@@ -22,10 +114,17 @@ def mendel_errors(parent_genotypes, progeny_genotypes):
         Genotype calls for the two parents.
     progeny_genotypes : array_like, int, shape (n_variants, n_progeny, 2)
         Genotype calls for the progeny.
+    chunk_size : int, optional
+        Number of variants to process per chunk, to bound memory usage for
+        the intermediate arrays.
+    workspace : MendelWorkspace, optional
+        Cache of scratch buffers to reuse across repeated calls over
+        similarly-shaped inputs; if not given, temporary arrays are
+        allocated fresh on each call.
 
     Returns
     -------
-    me : ndarray, int, shape (n_variants, n_progeny)
+    me : ndarray, int8, shape (n_variants, n_progeny)
         Count of Mendel errors for each progeny genotype call.
 
     Examples
@@ -79,7 +178,7 @@ def mendel_errors(parent_genotypes, progeny_genotypes):
                [0, 0, 0, 0],
                [0, 0, 0, 0],
                [0, 0, 0, 0],
-               [0, 0, 0, 0]])
+               [0, 0, 0, 0]], dtype=int8)
 
     The following are cases of 'non-parental' inheritance where one or two
     alleles are found in the progeny that are not present in either parent.
@@ -127,7 +226,7 @@ def mendel_errors(parent_genotypes, progeny_genotypes):
                [1, 1, 1, 2],
                [1, 1, 1, 2],
                [1, 1, 1, 2],
-               [1, 1, 1, 1]])
+               [1, 1, 1, 1]], dtype=int8)
 
     The following are cases of 'hemi-parental' inheritance, where progeny
     appear to have inherited two copies of an allele found only once in one of
@@ -155,7 +254,7 @@ def mendel_errors(parent_genotypes, progeny_genotypes):
                [1, 1],
                [1, 1],
                [1, 1],
-               [1, 1]])
+               [1, 1]], dtype=int8)
 
     The following are cases of 'uni-parental' inheritance, where progeny
     appear to have inherited both alleles from a single parent::
@@ -178,42 +277,147 @@ def mendel_errors(parent_genotypes, progeny_genotypes):
                [1, 1],
                [1, 1],
                [1, 1],
-               [1, 1]])
+               [1, 1]], dtype=int8)
 
     """
 
-    # setup
-    parent_genotypes = GenotypeArray(parent_genotypes)
-    progeny_genotypes = GenotypeArray(progeny_genotypes)
+    # setup; skip wrapping inputs that are already validated genotype arrays,
+    # which matters when called repeatedly on small chunks
+    if not isinstance(parent_genotypes, GenotypeArray):
+        parent_genotypes = GenotypeArray(parent_genotypes)
+    if not isinstance(progeny_genotypes, GenotypeArray):
+        progeny_genotypes = GenotypeArray(progeny_genotypes)
     check_ploidy(parent_genotypes.ploidy, 2)
     check_ploidy(progeny_genotypes.ploidy, 2)
 
-    # transform into per-call allele counts
-    max_allele = max(parent_genotypes.max(), progeny_genotypes.max())
-    parent_gc = parent_genotypes.to_allele_counts(max_allele=max_allele, dtype='i1')
-    progeny_gc = progeny_genotypes.to_allele_counts(max_allele=max_allele, dtype='i1')
-
-    # detect nonparental and hemiparental inheritance by comparing allele
-    # counts between parents and progeny
-    max_progeny_gc = parent_gc.clip(max=1).sum(axis=1)
-    max_progeny_gc = max_progeny_gc[:, np.newaxis, :]
-    me = (progeny_gc - max_progeny_gc).clip(min=0).sum(axis=2)
-
-    # detect uniparental inheritance by finding cases where no alleles are
-    # shared between parents, then comparing progeny allele counts to each
-    # parent
-    p1_gc = parent_gc[:, 0, np.newaxis, :]
-    p2_gc = parent_gc[:, 1, np.newaxis, :]
-    # find variants where parents don't share any alleles
-    is_shared_allele = (p1_gc > 0) & (p2_gc > 0)
-    no_shared_alleles = ~np.any(is_shared_allele, axis=2)
-    # find calls where progeny genotype is identical to one or the other parent
-    me[no_shared_alleles &
-       (np.all(progeny_gc == p1_gc, axis=2) |
-        np.all(progeny_gc == p2_gc, axis=2))] = 1
-
-    # retrofit where either or both parent has a missing call
-    me[np.any(parent_genotypes.is_missing(), axis=1)] = 0
+    # dispatch to the optimised implementation where possible, which computes
+    # the error count per genotype call in a single pass without materialising
+    # any intermediate allele count arrays
+    if parent_genotypes.dtype == np.int8 and progeny_genotypes.dtype == np.int8:
+        parents = memoryview_safe(parent_genotypes.values)
+        progeny = memoryview_safe(progeny_genotypes.values)
+        return _opt_mendel_errors_int8(parents, progeny)
+
+    # process the variant axis in chunks, so that peak memory for the
+    # intermediate arrays is bounded independent of the number of variants
+    n_variants, n_progeny = progeny_genotypes.shape[:2]
+    me = np.empty((n_variants, n_progeny), dtype=np.int8)
+    for start in range(0, n_variants, chunk_size):
+        stop = min(start + chunk_size, n_variants)
+        me[start:stop] = _mendel_errors_chunk(parent_genotypes[start:stop],
+                                              progeny_genotypes[start:stop],
+                                              workspace=workspace)
+    return me
+
+
+def _mendel_errors_chunk(parent_genotypes, progeny_genotypes, workspace=None):
+    """Compute Mendel error counts for a chunk of variants. Expects genotype
+    arrays that have already been validated."""
+
+    # find the highest allele index; scan both arrays in a single kernel
+    # call where possible, rather than two independent reductions
+    if parent_genotypes.dtype == progeny_genotypes.dtype:
+        max_allele = _opt_genotypes_max_allele(
+            memoryview_safe(parent_genotypes.values),
+            memoryview_safe(progeny_genotypes.values))
+    else:
+        max_allele = max(parent_genotypes.max(), progeny_genotypes.max())
+
+    if max_allele < 64:
+
+        # pack the alleles carried by each parent and by each progeny call
+        # into uint64 bitmasks, avoiding the dense per-call allele count
+        # arrays entirely
+        parents = parent_genotypes.values
+        progeny = progeny_genotypes.values
+        p1_mask = _allele_mask(parents[:, 0, :], workspace, 'p1')[:, np.newaxis]
+        p2_mask = _allele_mask(parents[:, 1, :], workspace, 'p2')[:, np.newaxis]
+        parent_mask = p1_mask | p2_mask
+        progeny_mask = _allele_mask(progeny, workspace, 'progeny')
+
+        # detect nonparental inheritance by counting progeny alleles not
+        # carried by either parent
+        if workspace is None:
+            nonparental_bits = progeny_mask & ~parent_mask
+        else:
+            nonparental_bits = np.bitwise_and(
+                progeny_mask, ~parent_mask,
+                out=workspace.get(progeny_mask.shape, np.uint64, 'nonparental'))
+        me = _popcount(nonparental_bits)
+
+        # detect nonparental and hemiparental inheritance in homozygous
+        # progeny, where errors are allele copies in excess of the number of
+        # parents carrying the allele
+        allele1 = progeny[:, :, 0]
+        allele2 = progeny[:, :, 1]
+        is_hom = (allele1 == allele2) & (allele1 >= 0)
+        shifts = allele1.clip(0).astype(np.uint64)
+        in_p1 = ((p1_mask >> shifts) & np.uint64(1)).astype(np.int8)
+        in_p2 = ((p2_mask >> shifts) & np.uint64(1)).astype(np.int8)
+        me = np.where(is_hom, np.maximum(2 - in_p1 - in_p2, 0), me)
+
+        # detect uniparental inheritance by finding cases where no alleles
+        # are shared between parents and the progeny genotype is identical to
+        # one or the other parent; N.B., for fully-called diploid genotypes,
+        # equal bitmasks imply identical genotypes
+        no_shared_alleles = (p1_mask & p2_mask) == 0
+        is_full_call = (allele1 >= 0) & (allele2 >= 0)
+        me[no_shared_alleles & is_full_call &
+           ((progeny_mask == p1_mask) | (progeny_mask == p2_mask))] = 1
+
+    else:
+
+        # rare case of allele indices too large to pack into a bitmask, fall
+        # back to dense per-call allele counts
+        parent_gc = np.asarray(
+            parent_genotypes.to_allele_counts(max_allele=max_allele, dtype='i1'))
+        progeny_gc = np.asarray(
+            progeny_genotypes.to_allele_counts(max_allele=max_allele, dtype='i1'))
+
+        # detect uniparental inheritance by finding cases where no alleles are
+        # shared between parents, then comparing progeny allele counts to each
+        # parent; N.B., do this first, because progeny_gc gets reused as a
+        # workspace below
+        p1_gc = parent_gc[:, 0, np.newaxis, :]
+        p2_gc = parent_gc[:, 1, np.newaxis, :]
+        # find variants where parents don't share any alleles; this is
+        # usually true at only a small fraction of variants, so restrict the
+        # expensive equality reductions to those rows
+        is_shared_allele = (p1_gc > 0) & (p2_gc > 0)
+        no_shared_alleles = ~np.any(is_shared_allele, axis=2)
+        idx = np.nonzero(no_shared_alleles[:, 0])[0]
+        # find calls where progeny genotype is identical to one or the other
+        # parent; route both equality comparisons through a single reused
+        # boolean buffer rather than materialising one per parent
+        pr_gc = progeny_gc[idx]
+        if workspace is None:
+            eq_buf = np.empty(pr_gc.shape, dtype=bool)
+        else:
+            # key the cached buffer on the full chunk shape, which is stable
+            # across calls, and slice to the data-dependent number of
+            # candidate rows
+            eq_buf = workspace.get(progeny_gc.shape, bool, 'eq')[:len(idx)]
+        np.equal(pr_gc, p1_gc[idx], out=eq_buf)
+        uniparental = eq_buf.all(axis=2)
+        np.equal(pr_gc, p2_gc[idx], out=eq_buf)
+        uniparental |= eq_buf.all(axis=2)
+
+        # detect nonparental and hemiparental inheritance by comparing allele
+        # counts between parents and progeny; fuse the clip into the sum via
+        # boolean promotion and compute the excess allele counts in-place,
+        # reusing progeny_gc as the output buffer, to avoid allocating further
+        # dense temporaries
+        max_progeny_gc = (parent_gc > 0).sum(axis=1, dtype=np.int8)
+        np.subtract(progeny_gc, max_progeny_gc[:, np.newaxis, :], out=progeny_gc)
+        np.maximum(progeny_gc, 0, out=progeny_gc)
+        me = progeny_gc.sum(axis=2, dtype=np.int8)
+        row, col = np.nonzero(uniparental)
+        me[idx[row], col] = 1
+
+    # retrofit where either or both parent has a missing call; scan the raw
+    # values directly in a single fused reduction, rather than materialising
+    # a per-call missingness array first
+    me[np.any(parent_genotypes.values < 0, axis=(1, 2))] = 0
 
     return me
 
@@ -278,26 +482,76 @@ def paint_transmission(parent_haplotypes, progeny_haplotypes):
 
     """
 
-    # check inputs
-    parent_haplotypes = HaplotypeArray(parent_haplotypes)
-    progeny_haplotypes = HaplotypeArray(progeny_haplotypes)
+    # check inputs; skip wrapping inputs that are already validated
+    # haplotype arrays
+    if not isinstance(parent_haplotypes, HaplotypeArray):
+        parent_haplotypes = HaplotypeArray(parent_haplotypes)
+    if not isinstance(progeny_haplotypes, HaplotypeArray):
+        progeny_haplotypes = HaplotypeArray(progeny_haplotypes)
     if parent_haplotypes.n_haplotypes != 2:
         raise ValueError('exactly two parental haplotypes should be provided')
 
+    # dispatch to the optimised implementation where possible, which paints
+    # each allele call in a single fused pass without any intermediate
+    # boolean arrays
+    if parent_haplotypes.dtype == np.int8 and progeny_haplotypes.dtype == np.int8:
+        parent = memoryview_safe(parent_haplotypes.values)
+        progeny = memoryview_safe(progeny_haplotypes.values)
+        return _opt_paint_transmission_int8(parent, progeny)
+
+    parents = parent_haplotypes.values
+    progeny = np.asarray(progeny_haplotypes)
+    n_progeny = progeny.shape[1]
+
+    # where either parental allele is missing, the painting for the whole row
+    # depends only on progeny missingness, so when such rows dominate (e.g.,
+    # low-coverage parents) run the full logic only on the remaining slice
+    parent_missing_rows = (parents < 0).any(axis=1)
+    if parent_missing_rows.sum() > 0.5 * parents.shape[0]:
+        painting = np.empty(progeny.shape, dtype='u1')
+        painting[parent_missing_rows] = np.where(
+            progeny[parent_missing_rows] < 0,
+            INHERIT_MISSING, INHERIT_PARENT_MISSING)
+        called = ~parent_missing_rows
+        painting[called] = _paint_transmission(parents[called, 0, np.newaxis],
+                                               parents[called, 1, np.newaxis],
+                                               progeny[called])
+        return painting
+
+    if n_progeny <= 64:
+        # with few progeny, compute on the transposed layout, so that the
+        # parental allele vectors stay cache-resident while the (larger)
+        # progeny array is streamed with a contiguous inner loop
+        painting = _paint_transmission(parents[np.newaxis, :, 0],
+                                       parents[np.newaxis, :, 1],
+                                       np.ascontiguousarray(progeny.T))
+        painting = np.ascontiguousarray(painting.T)
+    else:
+        painting = _paint_transmission(parents[:, 0, np.newaxis],
+                                       parents[:, 1, np.newaxis],
+                                       progeny)
+
+    return painting
+
+
+def _paint_transmission(parent1, parent2, progeny_haplotypes):
+    """Compute the painting given arrays of first and second parental
+    alleles and a 2-D array of progeny haplotypes. Works on either
+    orientation of the progeny array, provided the parental alleles
+    broadcast against it."""
+
     # convenience variables
-    parent1 = parent_haplotypes[:, 0, np.newaxis]
-    parent2 = parent_haplotypes[:, 1, np.newaxis]
     progeny_is_missing = progeny_haplotypes < 0
-    parent_is_missing = np.any(parent_haplotypes < 0, axis=1)
-    # need this for broadcasting, but also need to retain original for later
-    parent_is_missing_bc = parent_is_missing[:, np.newaxis]
-    parent_diplotype = GenotypeArray(parent_haplotypes[:, np.newaxis, :])
-    parent_is_hom_ref = parent_diplotype.is_hom_ref()
-    parent_is_het = parent_diplotype.is_het()
-    parent_is_hom_alt = parent_diplotype.is_hom_alt()
+    parent_is_missing = (parent1 < 0) | (parent2 < 0)
+    # compare parental alleles directly, which avoids constructing a
+    # genotype array and re-reading the parental haplotypes for each of the
+    # hom/het conditions
+    parent_is_hom_ref = (parent1 == 0) & (parent2 == 0)
+    parent_is_het = (parent1 != parent2) & (parent1 >= 0) & (parent2 >= 0)
+    parent_is_hom_alt = (parent1 > 0) & (parent1 == parent2)
 
     # identify allele calls where inheritance can be determined
-    is_callable = ~progeny_is_missing & ~parent_is_missing_bc
+    is_callable = ~progeny_is_missing & ~parent_is_missing
     is_callable_seg = is_callable & parent_is_het
 
     # main inheritance states
@@ -309,21 +563,110 @@ def paint_transmission(parent_haplotypes, progeny_haplotypes):
         is_callable & (progeny_haplotypes != parent1) & (progeny_haplotypes != parent2)
     )
 
-    # record inheritance states
-    # N.B., order in which these are set matters
-    painting = np.zeros(progeny_haplotypes.shape, dtype='u1')
-    painting[inherit_parent1] = INHERIT_PARENT1
-    painting[inherit_parent2] = INHERIT_PARENT2
-    painting[nonseg_ref] = INHERIT_NONSEG_REF
-    painting[nonseg_alt] = INHERIT_NONSEG_ALT
-    painting[nonparental] = INHERIT_NONPARENTAL
-    painting[parent_is_missing] = INHERIT_PARENT_MISSING
-    painting[progeny_is_missing] = INHERIT_MISSING
+    # record inheritance states in a single pass, taking the first matching
+    # state for each allele call
+    # N.B., order of conditions matters, earlier conditions take precedence
+    condlist = [progeny_is_missing,
+                np.broadcast_to(parent_is_missing, progeny_haplotypes.shape),
+                nonparental,
+                nonseg_alt,
+                nonseg_ref,
+                inherit_parent2,
+                inherit_parent1]
+    choicelist = [INHERIT_MISSING,
+                  INHERIT_PARENT_MISSING,
+                  INHERIT_NONPARENTAL,
+                  INHERIT_NONSEG_ALT,
+                  INHERIT_NONSEG_REF,
+                  INHERIT_PARENT2,
+                  INHERIT_PARENT1]
+    painting = np.select(condlist, choicelist,
+                         default=INHERIT_UNDETERMINED).astype('u1')
 
     return painting
 
 
-def phase_progeny_by_transmission(g):
+def mendel_errors_and_paint(parent_genotypes, progeny_genotypes):
+    """Compute Mendel errors and paint progeny allelic inheritance in a
+    single pass over phased trio genotype calls.
+
+    Parameters
+    ----------
+    parent_genotypes : array_like, int, shape (n_variants, 2, 2)
+        Genotype calls for the two parents.
+    progeny_genotypes : array_like, int, shape (n_variants, n_progeny, 2)
+        Phased genotype calls for the progeny, with the first allele
+        inherited from the first parent and the second allele from the
+        second parent.
+
+    Returns
+    -------
+    me : ndarray, int8, shape (n_variants, n_progeny)
+        Mendel error counts, as from :func:`mendel_errors`.
+    painting : ndarray, uint8, shape (n_variants, n_progeny, 2)
+        Inheritance paintings, with each progeny allele painted against the
+        genotype of the transmitting parent using the same coding as
+        :func:`paint_transmission`.
+
+    Notes
+    -----
+    Prefer this function over calling :func:`mendel_errors` and
+    :func:`paint_transmission` separately when both outputs are needed, as
+    the optimised implementation traverses the input arrays only once.
+
+    Examples
+    --------
+    >>> import allel
+    >>> import numpy as np
+    >>> genotypes = np.array([
+    ...     [[0, 0], [1, 1], [0, 1], [1, 1]],
+    ...     [[0, 1], [0, 1], [0, 0], [0, 2]],
+    ...     [[-1, -1], [0, 0], [0, 0], [0, 0]],
+    ... ], dtype='i1')
+    >>> me, painting = allel.stats.mendel_errors_and_paint(
+    ...     genotypes[:, :2], genotypes[:, 2:])
+    >>> me
+    array([[0, 1],
+           [0, 1],
+           [0, 0]], dtype=int8)
+    >>> painting
+    array([[[3, 4],
+            [5, 4]],
+    <BLANKLINE>
+           [[1, 1],
+            [1, 5]],
+    <BLANKLINE>
+           [[6, 3],
+            [6, 3]]], dtype=uint8)
+
+    """
+
+    # setup
+    if not isinstance(parent_genotypes, GenotypeArray):
+        parent_genotypes = GenotypeArray(parent_genotypes)
+    if not isinstance(progeny_genotypes, GenotypeArray):
+        progeny_genotypes = GenotypeArray(progeny_genotypes)
+    check_ploidy(parent_genotypes.ploidy, 2)
+    check_ploidy(progeny_genotypes.ploidy, 2)
+
+    # dispatch to the optimised implementation where possible, which computes
+    # both outputs in a single traversal of the inputs
+    if parent_genotypes.dtype == np.int8 and progeny_genotypes.dtype == np.int8:
+        parents = memoryview_safe(parent_genotypes.values)
+        progeny = memoryview_safe(progeny_genotypes.values)
+        return _opt_mendel_errors_and_paint_int8(parents, progeny)
+
+    # general case, compose the single-output functions
+    me = mendel_errors(parent_genotypes, progeny_genotypes)
+    progeny = progeny_genotypes.values
+    painting = np.empty(progeny.shape, dtype='u1')
+    for k in range(2):
+        painting[:, :, k] = paint_transmission(parent_genotypes.values[:, k],
+                                               progeny[:, :, k])
+    return me, painting
+
+
+def phase_progeny_by_transmission(g, use_threads=True):
     """Phase progeny genotypes from a trio or cross using Mendelian
     transmission.
 
@@ -332,6 +675,9 @@ def phase_progeny_by_transmission(g):
     g : array_like, int, shape (n_variants, n_samples, 2)
         Genotype array, with parents as first two columns and progeny as
         remaining columns.
+    use_threads : bool, optional
+        If True use multiple threads to phase large inputs, partitioning
+        the work over the variant axis.
 
     Returns
     -------
@@ -396,10 +742,10 @@ def phase_progeny_by_transmission(g):
     check_ploidy(g.ploidy, 2)
     check_min_samples(g.n_samples, 3)
 
-    # run the phasing
+    # run the phasing, partitioning the work across threads for large inputs
     # N.B., a copy has already been made, so no need to make memoryview safe
-    is_phased = _opt_phase_progeny_by_transmission(g.values)
-    g.is_phased = np.asarray(is_phased).view(bool)
+    is_phased = _phase_progeny(g.values, use_threads=use_threads)
+    g.is_phased = is_phased.view(bool)
 
     # outputs
     return g
@@ -468,9 +814,12 @@ def phase_by_transmission(g, window_size, copy=True):
 
     """
 
-    # setup
-    g = np.asarray(g, dtype='i1')
-    g = GenotypeArray(g, copy=copy)
+    # setup; convert dtype and copy in a single step, rather than converting
+    # and then copying the converted array again; N.B., copy=False can only
+    # be honoured for int8 input, and numpy >= 2.0 raises rather than copies
+    # when a dtype conversion is requested without a copy
+    g = np.asarray(g)
+    g = GenotypeArray(g, dtype='i1', copy=copy if g.dtype == np.int8 else True)
     g._values = memoryview_safe(g.values)
     check_ploidy(g.ploidy, 2)
     check_min_samples(g.n_samples, 3)
@@ -8,31 +8,52 @@ from numpy.testing import assert_array_equal
 
 
 from allel.stats.mendel import mendel_errors, paint_transmission, \
+    mendel_errors_and_paint, MendelWorkspace, \
     INHERIT_PARENT1, INHERIT_PARENT2, INHERIT_NONPARENTAL, \
     INHERIT_NONSEG_REF, INHERIT_NONSEG_ALT, INHERIT_MISSING, \
-    INHERIT_PARENT_MISSING, phase_progeny_by_transmission
+    INHERIT_PARENT_MISSING, phase_progeny_by_transmission, phase_by_transmission, \
+    _PHASE_PARALLEL_THRESHOLD
 
 
 class TestMendelErrors(unittest.TestCase):
 
     @staticmethod
     def _test(genotypes, expect):
-        parent_genotypes = genotypes[:, 0:2]
-        progeny_genotypes = genotypes[:, 2:]
-
-        # run test
-        actual = mendel_errors(parent_genotypes, progeny_genotypes)
-        assert_array_equal(expect, actual)
-
-        # swap parents, should have no affect
-        actual = mendel_errors(parent_genotypes, progeny_genotypes)
-        assert_array_equal(expect, actual)
-
-        # swap alleles, should have no effect
-        parent_genotypes = parent_genotypes[:, :, ::-1]
-        progeny_genotypes = progeny_genotypes[:, :, ::-1]
-        actual = mendel_errors(parent_genotypes, progeny_genotypes)
-        assert_array_equal(expect, actual)
+        # check both the optimised int8 implementation and the general
+        # numpy implementation
+        for dtype in None, 'i1':
+            if dtype is None:
+                gt = genotypes
+            else:
+                gt = genotypes.astype(dtype)
+            parent_genotypes = gt[:, 0:2]
+            progeny_genotypes = gt[:, 2:]
+
+            # run test
+            actual = mendel_errors(parent_genotypes, progeny_genotypes)
+            assert_array_equal(expect, actual)
+
+            # chunked execution should give identical results
+            actual = mendel_errors(parent_genotypes, progeny_genotypes,
+                                   chunk_size=2)
+            assert_array_equal(expect, actual)
+
+            # reusing a workspace across calls should give identical results
+            workspace = MendelWorkspace()
+            for _ in range(2):
+                actual = mendel_errors(parent_genotypes, progeny_genotypes,
+                                       workspace=workspace)
+                assert_array_equal(expect, actual)
+
+            # swap parents, should have no affect
+            actual = mendel_errors(parent_genotypes, progeny_genotypes)
+            assert_array_equal(expect, actual)
+
+            # swap alleles, should have no effect
+            parent_genotypes = parent_genotypes[:, :, ::-1]
+            progeny_genotypes = progeny_genotypes[:, :, ::-1]
+            actual = mendel_errors(parent_genotypes, progeny_genotypes)
+            assert_array_equal(expect, actual)
 
     def test_consistent(self):
         genotypes = np.array([
@@ -157,6 +178,21 @@ class TestMendelErrors(unittest.TestCase):
         ])
         self._test(genotypes, expect)
 
+    def test_large_alleles(self):
+        # exercise the fallback for alleles too large to pack into a uint64
+        # bitmask
+        genotypes = np.array([
+            [[0, 0], [70, 70], [0, 70], [70, 70]],
+            [[0, 0], [0, 70], [70, 70], [-1, -1]],
+            [[0, 0], [70, 70], [0, 0], [70, 70]],
+        ])
+        expect = np.array([
+            [0, 1],
+            [1, 0],
+            [1, 1],
+        ])
+        self._test(genotypes, expect)
+
     def test_parent_missing(self):
         genotypes = np.array([
             [[-1, -1], [0, 0], [0, 0], [1, 1]],
@@ -171,6 +207,34 @@ class TestMendelErrors(unittest.TestCase):
         self._test(genotypes, expect)
 
 
+def test_mendel_errors_and_paint():
+
+    genotypes = np.array([
+        [[0, 0], [1, 1], [0, 1], [1, 1]],
+        [[0, 1], [0, 1], [0, 0], [0, 2]],
+        [[0, 1], [2, 3], [0, 2], [1, 3]],
+        [[-1, -1], [0, 0], [0, 0], [-1, 0]],
+    ])
+    # check both the optimised int8 implementation and the general numpy
+    # implementation
+    for dtype in None, 'i1':
+        if dtype is None:
+            gt = genotypes
+        else:
+            gt = genotypes.astype(dtype)
+        parent_genotypes = gt[:, :2]
+        progeny_genotypes = gt[:, 2:]
+        me, painting = mendel_errors_and_paint(parent_genotypes,
+                                               progeny_genotypes)
+        # outputs should agree with the single-output functions
+        assert_array_equal(mendel_errors(parent_genotypes, progeny_genotypes),
+                           me)
+        for k in range(2):
+            expect_painting = paint_transmission(parent_genotypes[:, k],
+                                                 progeny_genotypes[:, :, k])
+            assert_array_equal(expect_painting, painting[:, :, k])
+
+
 def test_paint_transmission():
 
     haplotypes = []
@@ -241,8 +305,28 @@ def test_paint_transmission():
     ])
 
     haplotypes = np.array(haplotypes)
-    actual = paint_transmission(haplotypes[:, :2], haplotypes[:, 2:])
-    assert_array_equal(expect, actual)
+    # check both the optimised int8 implementation and the general numpy
+    # implementation
+    for dtype in None, 'i1':
+        if dtype is None:
+            h = haplotypes
+        else:
+            h = haplotypes.astype(dtype)
+        actual = paint_transmission(h[:, :2], h[:, 2:])
+        assert_array_equal(expect, actual)
+
+    # tile above 64 progeny to exercise the wide layout code path
+    progeny_wide = np.tile(haplotypes[:, 2:], (1, 17))
+    actual = paint_transmission(haplotypes[:, :2], progeny_wide)
+    assert_array_equal(np.tile(expect, (1, 17)), actual)
+
+    # repeat the missing-parent rows so they dominate, to exercise the
+    # sparse fast path
+    haplotypes_sparse = np.concatenate([haplotypes] + [haplotypes[5:]] * 10)
+    expect_sparse = np.concatenate([expect] + [expect[5:]] * 10)
+    actual = paint_transmission(haplotypes_sparse[:, :2],
+                                haplotypes_sparse[:, 2:])
+    assert_array_equal(expect_sparse, actual)
 
 
 def test_phase_progeny_by_transmission():
@@ -314,3 +398,32 @@ def test_phase_progeny_by_transmission():
     ga = phase_progeny_by_transmission(g)
     assert_array_equal(gp, ga)
     assert_array_equal(expect_is_phased, ga.is_phased)
+
+    # tile the input above the parallel threshold to exercise the threaded
+    # code path
+    reps = (_PHASE_PARALLEL_THRESHOLD // len(gu)) + 1
+    g = np.tile(np.array(gu, dtype='i1'), (reps, 1, 1))
+    for use_threads in True, False:
+        ga = phase_progeny_by_transmission(g, use_threads=use_threads)
+        assert_array_equal(np.tile(gp, (reps, 1, 1)), ga)
+        assert_array_equal(np.tile(expect_is_phased, (reps, 1)), ga.is_phased)
+
+
+def test_phase_by_transmission_copy():
+
+    genotypes = np.array([
+        [[0, 0], [0, 1], [0, 0], [0, 1]],
+        [[0, 1], [0, 0], [0, 0], [0, 1]],
+        [[0, 0], [1, 1], [0, 1], [0, 1]],
+    ])
+
+    # copy=False can only be honoured for int8 input; for other dtypes a
+    # copy should be made rather than an error raised
+    g = phase_by_transmission(genotypes, window_size=10, copy=False)
+    assert np.int8 == g.dtype
+    assert not np.shares_memory(np.asarray(g), genotypes)
+
+    # for int8 input, copy=False should phase in-place
+    genotypes_i1 = genotypes.astype('i1')
+    g = phase_by_transmission(genotypes_i1, window_size=10, copy=False)
+    assert np.shares_memory(np.asarray(g), genotypes_i1)